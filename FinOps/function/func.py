@@ -10,17 +10,21 @@ Environment Variables:
     DEST_NAMESPACE: Destination Object Storage namespace
     DEST_BUCKET: Destination bucket name (default: "finops-focus-reports")
     PRESERVE_PATH: Whether to preserve date folder structure (default: "true")
+    COPY_WORKERS: Number of files copied concurrently (default: 16)
     LOG_LEVEL: Logging level (default: "INFO")
 
 Author: Based on Oracle oci-o11y-solutions, enhanced for production use
 License: UPL-1.0
 """
 
+import contextlib
 import io
 import json
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -33,10 +37,33 @@ DEST_NAMESPACE = os.environ.get("DEST_NAMESPACE", "")
 DEST_BUCKET = os.environ.get("DEST_BUCKET", "finops-focus-reports")
 PRESERVE_PATH = os.environ.get("PRESERVE_PATH", "true").lower() == "true"
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+COPY_WORKERS = max(1, int(os.environ.get("COPY_WORKERS", "16")))
 
 # Oracle's internal FOCUS report location (constant)
 REPORTING_NAMESPACE = "bling"
 
+# Chunk size used when streaming objects through the function
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Objects larger than this are uploaded in parallel parts (multipart upload).
+# Each large copy buffers the parts in flight plus the one being read,
+# (4 + 1) x 16 MiB = 80 MiB, so at most MULTIPART_MAX_COPIES run at once:
+# as many as fit in half the function's memory (FN_MEMORY, in MB), leaving
+# the rest for the runtime and the other, streamed, copies. At the default
+# 256 MB, large copies run one at a time.
+MULTIPART_THRESHOLD = 64 * 1024 * 1024
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_PARALLEL_PARTS = 4
+MULTIPART_BUFFER_BYTES = (MULTIPART_PARALLEL_PARTS + 1) * MULTIPART_PART_SIZE
+FUNCTION_MEMORY_MB = int(os.environ.get("FN_MEMORY", "256"))
+MULTIPART_MAX_COPIES = max(
+    1, FUNCTION_MEMORY_MB * 1024 * 1024 // 2 // MULTIPART_BUFFER_BYTES
+)
+
+# Keep-alive connections to Object Storage: one per copy worker, plus the
+# parallel part uploads of the multipart copies allowed to run at once
+HTTP_POOL_SIZE = COPY_WORKERS + MULTIPART_MAX_COPIES * MULTIPART_PARALLEL_PARTS
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL, logging.INFO),
@@ -45,14 +72,79 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _full_path(source_object_name: str) -> str:
+    """Keep the full path: FOCUS Reports/2025/01/26/report.csv"""
+    return source_object_name
+
+
+def _file_name(source_object_name: str) -> str:
+    """Just the filename: report.csv"""
+    return source_object_name.rsplit("/", 1)[-1]
+
+
+# PRESERVE_PATH is fixed for the life of the process, so pick once
+destination_object_name = _full_path if PRESERVE_PATH else _file_name
+
+
+class ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks.
+
+    Lets a streamed GET response be passed straight to put_object without
+    holding the whole object in memory.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class IncompleteCopyError(Exception):
+    """A copied object's size does not match the source object."""
+
+
 class FocusReportCopier:
     """Handles copying FOCUS reports from Oracle's internal bucket to customer bucket."""
 
+    # Tenancy OCIDs by signer tenancy_id, kept across warm invocations
+    _tenancy_ocids = {}
+
     def __init__(self, signer):
         """Initialize with OCI signer for authentication."""
         self.object_storage = oci.object_storage.ObjectStorageClient(
             config={}, signer=signer
         )
+        # The SDK's default pool (10 connections) would throttle the workers;
+        # retries stay with the SDK's own retry strategy. The adapter class
+        # comes from the session, not from the SDK's private vendored module
+        session = self.object_storage.base_client.session
+        adapter_class = type(session.get_adapter("https://"))
+        session.mount("https://", adapter_class(pool_maxsize=HTTP_POOL_SIZE))
+        self.upload_manager = oci.object_storage.UploadManager(
+            self.object_storage,
+            allow_parallel_uploads=True,
+            parallel_process_count=MULTIPART_PARALLEL_PARTS
+        )
+        # Caps concurrent multipart copies to the function's memory
+        self._multipart_slots = threading.BoundedSemaphore(MULTIPART_MAX_COPIES)
+        # Destination object names keyed by listing prefix (None if the
+        # listing failed), and an Event per prefix set once it is filled in
+        self._dest_index = {}
+        self._dest_listed = {}
+        self._dest_index_lock = threading.Lock()
         self.stats = {
             "days_processed": 0,
             "files_checked": 0,
@@ -61,99 +153,213 @@ class FocusReportCopier:
             "bytes_copied": 0,
             "errors": []
         }
+        # copy_file runs on worker threads; guard shared stats updates
+        self._stats_lock = threading.Lock()
+
+    def _increment(self, key: str, amount: int = 1):
+        """Thread-safe increment of a numeric stats counter."""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _record_error(self, error_msg: str):
+        """Log an error and record it in stats."""
+        logger.error(error_msg)
+        with self._stats_lock:
+            self.stats["errors"].append(error_msg)
 
     def get_source_tenancy_ocid(self) -> str:
-        """Get the source tenancy OCID from the signer."""
+        """Get the source tenancy OCID from the signer.
+
+        Lookups are cached per signer tenancy, so warm invocations of the
+        function skip the Identity call.
+        """
+        tenancy_id = self.object_storage.base_client.signer.tenancy_id
+        cached = FocusReportCopier._tenancy_ocids.get(tenancy_id)
+        if cached:
+            return cached
+
         try:
             identity = oci.identity.IdentityClient(
                 config={}, signer=self.object_storage.base_client.signer
             )
-            tenancy = identity.get_tenancy(
-                self.object_storage.base_client.signer.tenancy_id
-            ).data
+            tenancy = identity.get_tenancy(tenancy_id).data
+            FocusReportCopier._tenancy_ocids[tenancy_id] = tenancy.id
             return tenancy.id
         except Exception as e:
-            logger.warning(f"Could not get tenancy OCID: {e}")
+            logger.warning("Could not get tenancy OCID: %s", e)
             # Fallback: use the signer's tenancy_id directly
-            return self.object_storage.base_client.signer.tenancy_id
+            return tenancy_id
 
-    def file_exists_in_destination(self, object_name: str) -> bool:
-        """Check if a file already exists in the destination bucket."""
+    def index_destination(self, prefix: str):
+        """
+        List destination objects under a prefix once, so files that were
+        already copied are skipped without attempting the copy.
+        """
+        with self._dest_index_lock:
+            # Days are listed concurrently; only the first caller lists a prefix
+            listed = self._dest_listed.get(prefix)
+            first_caller = listed is None
+            if first_caller:
+                listed = self._dest_listed[prefix] = threading.Event()
+        if not first_caller:
+            # Wait for the listing in flight, so no copy is queued before it
+            listed.wait()
+            return
+
+        names = None
         try:
-            self.object_storage.head_object(
+            objects = oci.pagination.list_call_get_all_results(
+                self.object_storage.list_objects,
                 namespace_name=DEST_NAMESPACE,
                 bucket_name=DEST_BUCKET,
-                object_name=object_name
+                prefix=prefix,
+                fields="name"
             )
-            return True
-        except oci.exceptions.ServiceError as e:
-            if e.status == 404:
-                return False
-            raise
+            names = {obj.name for obj in objects.data.objects}
+        except Exception as e:
+            # The index only saves copy attempts; unlisted files still get a
+            # conditional write, so a failed listing must not stop the day
+            logger.warning("Could not list destination prefix '%s': %s", prefix, e)
+        finally:
+            self._dest_index[prefix] = names
+            listed.set()
 
-    def copy_file(self, source_tenancy: str, source_object_name: str) -> bool:
+    def file_exists_in_destination(self, object_name: str) -> bool:
         """
-        Copy a single file from source to destination.
+        Check the destination listing for a file.
 
-        Returns True if file was copied, False if skipped or failed.
+        Files not covered by a listing are reported as missing; the copy
+        itself is conditional (If-None-Match: *), so an existing object is
+        never overwritten.
         """
-        # Determine destination object name
-        if PRESERVE_PATH:
-            # Keep the full path: FOCUS Reports/2025/01/26/report.csv
-            dest_object_name = source_object_name
-        else:
-            # Just the filename: report.csv
-            dest_object_name = source_object_name.rsplit("/", 1)[-1]
-
-        # Check if file already exists
-        if self.file_exists_in_destination(dest_object_name):
-            logger.debug(f"Skipping (exists): {dest_object_name}")
-            self.stats["files_skipped"] += 1
-            return False
+        # Snapshot: other days' listings may add prefixes concurrently
+        for prefix, listed in tuple(self._dest_listed.items()):
+            if not listed.is_set() or not object_name.startswith(prefix):
+                continue
+            names = self._dest_index[prefix]
+            if names is not None:
+                return object_name in names
+        return False
+
+    def _stream_copy(
+        self, source_tenancy: str, source_object_name: str, dest_object_name: str,
+        size: int = 0
+    ) -> int:
+        """
+        Copy an object by streaming the source GET into the destination,
+        using a multipart upload for objects listed as larger than
+        MULTIPART_THRESHOLD.
 
-        try:
-            # Get object from source
-            logger.info(f"Copying: {source_object_name}")
+        Returns the number of bytes copied.
+        """
+        multipart = size > MULTIPART_THRESHOLD
+        # Large copies wait for a memory slot before opening the download,
+        # so a queued copy never holds an idle connection
+        with self._multipart_slots if multipart else contextlib.nullcontext():
             obj_response = self.object_storage.get_object(
                 namespace_name=REPORTING_NAMESPACE,
                 bucket_name=source_tenancy,
                 object_name=source_object_name
             )
+            content_length = int(obj_response.headers["content-length"])
 
-            # Stream to destination
-            content = obj_response.data.content
-            content_length = len(content)
+            # Pass the raw bytes through undecoded, keeping any Content-Encoding
+            body = ChunkStream(
+                obj_response.data.raw.stream(STREAM_CHUNK_SIZE, decode_content=False)
+            )
+            # Fail with 412 instead of overwriting an object that already exists
+            put_kwargs = {"if_none_match": "*"}
+            if obj_response.headers.get("content-encoding"):
+                put_kwargs["content_encoding"] = obj_response.headers["content-encoding"]
+
+            if multipart:
+                # upload_stream ends the upload at the first short read, and a
+                # raw read returns one streamed chunk; buffered reads fill parts
+                self.upload_manager.upload_stream(
+                    DEST_NAMESPACE,
+                    DEST_BUCKET,
+                    dest_object_name,
+                    io.BufferedReader(body, STREAM_CHUNK_SIZE),
+                    part_size=MULTIPART_PART_SIZE,
+                    **put_kwargs
+                )
+                committed = int(self.object_storage.head_object(
+                    namespace_name=DEST_NAMESPACE,
+                    bucket_name=DEST_BUCKET,
+                    object_name=dest_object_name
+                ).headers["content-length"])
+                if committed != content_length:
+                    # Later runs skip existing names, so never leave a partial copy
+                    self.object_storage.delete_object(
+                        namespace_name=DEST_NAMESPACE,
+                        bucket_name=DEST_BUCKET,
+                        object_name=dest_object_name
+                    )
+                    raise IncompleteCopyError(
+                        f"uploaded {committed} of {content_length} bytes"
+                    )
+            else:
+                self.object_storage.put_object(
+                    namespace_name=DEST_NAMESPACE,
+                    bucket_name=DEST_BUCKET,
+                    object_name=dest_object_name,
+                    put_object_body=body,
+                    content_length=content_length,
+                    **put_kwargs
+                )
+        return content_length
+
+    def copy_file(self, source_tenancy: str, source_object_name: str, size: int = 0) -> bool:
+        """
+        Copy a single file from source to destination.
 
-            self.object_storage.put_object(
-                namespace_name=DEST_NAMESPACE,
-                bucket_name=DEST_BUCKET,
-                object_name=dest_object_name,
-                put_object_body=content
+        Returns True if file was copied, False if skipped or failed.
+        """
+        dest_object_name = destination_object_name(source_object_name)
+
+        # Check if file already exists
+        if self.file_exists_in_destination(dest_object_name):
+            logger.debug("Skipping (exists): %s", dest_object_name)
+            self._increment("files_skipped")
+            return False
+
+        try:
+            logger.info("Copying: %s", source_object_name)
+            content_length = self._stream_copy(
+                source_tenancy, source_object_name, dest_object_name, size
             )
 
-            self.stats["files_copied"] += 1
-            self.stats["bytes_copied"] += content_length
-            logger.info(f"Copied: {dest_object_name} ({content_length:,} bytes)")
+            self._increment("files_copied")
+            self._increment("bytes_copied", content_length)
+            logger.info("Copied: %s (%d bytes)", dest_object_name, content_length)
             return True
 
         except oci.exceptions.ServiceError as e:
-            error_msg = f"Failed to copy {source_object_name}: {e.message}"
-            logger.error(error_msg)
-            self.stats["errors"].append(error_msg)
+            if e.status == 412:
+                # If-None-Match: * rejected the write; the file already exists
+                logger.debug("Skipping (exists): %s", dest_object_name)
+                self._increment("files_skipped")
+                return False
+            self._record_error(f"Failed to copy {source_object_name}: {e.message}")
+            return False
+        except (oci.exceptions.MultipartUploadError, IncompleteCopyError) as e:
+            # The upload failed or came up short; the next run picks the
+            # file up again
+            self._record_error(f"Failed to copy {source_object_name}: {e}")
             return False
 
-    def process_day(self, source_tenancy: str, target_date: datetime) -> int:
+    def list_day_objects(self, source_tenancy: str, target_date: datetime) -> list:
         """
-        Process all FOCUS reports for a specific day.
+        List all FOCUS reports for a specific day.
 
-        Returns number of files copied.
+        Returns the object summaries (name and size) under the day's prefix.
         """
         prefix = (
             f"FOCUS Reports/{target_date.year}/"
             f"{target_date.strftime('%m')}/{target_date.strftime('%d')}"
         )
 
-        logger.info(f"Processing date: {target_date.strftime('%Y-%m-%d')} (prefix: {prefix})")
+        logger.info("Processing date: %s (prefix: %s)", target_date.date(), prefix)
 
         try:
             # List all objects with this prefix
@@ -161,44 +367,72 @@ class FocusReportCopier:
                 self.object_storage.list_objects,
                 namespace_name=REPORTING_NAMESPACE,
                 bucket_name=source_tenancy,
-                prefix=prefix
+                prefix=prefix,
+                fields="name,size"
             )
 
-            files_copied = 0
-            for obj in objects.data.objects:
-                self.stats["files_checked"] += 1
-                if self.copy_file(source_tenancy, obj.name):
-                    files_copied += 1
+            # Without PRESERVE_PATH files land in the bucket root, so the
+            # whole destination bucket is listed (once per run)
+            self.index_destination(prefix if PRESERVE_PATH else "")
 
-            self.stats["days_processed"] += 1
-            return files_copied
+            self._increment("days_processed")
+            return objects.data.objects
 
         except oci.exceptions.ServiceError as e:
-            error_msg = f"Failed to list objects for {prefix}: {e.message}"
-            logger.error(error_msg)
-            self.stats["errors"].append(error_msg)
-            return 0
+            self._record_error(f"Failed to list objects for {prefix}: {e.message}")
+            return []
 
     def run(self, source_tenancy: str) -> dict:
         """
         Main execution: process all days in the lookback window.
 
+        All days are listed concurrently on a thread pool, and each day's
+        copies are queued on the same pool as soon as its listing returns,
+        so the network is never idle waiting for the next day's listing.
+
         Returns statistics dictionary.
         """
-        logger.info(f"Starting FOCUS report copy (lookback: {LOOKBACK_DAYS} days)")
-        logger.info(f"Source: {REPORTING_NAMESPACE}/{source_tenancy}")
-        logger.info(f"Destination: {DEST_NAMESPACE}/{DEST_BUCKET}")
-
-        # Process each day in the lookback window (oldest first)
-        for days_ago in range(LOOKBACK_DAYS, 0, -1):
-            target_date = datetime.now() - timedelta(days=days_ago)
-            self.process_day(source_tenancy, target_date)
+        logger.info("Starting FOCUS report copy (lookback: %d days)", LOOKBACK_DAYS)
+        logger.info("Source: %s/%s", REPORTING_NAMESPACE, source_tenancy)
+        logger.info("Destination: %s/%s", DEST_NAMESPACE, DEST_BUCKET)
+
+        now = datetime.now()
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            # List each day in the lookback window (oldest first)
+            listings = [
+                executor.submit(
+                    self.list_day_objects, source_tenancy, now - timedelta(days=days_ago)
+                )
+                for days_ago in range(LOOKBACK_DAYS, 0, -1)
+            ]
+
+            copies = {}
+            for listing in as_completed(listings):
+                try:
+                    objects = listing.result()
+                except Exception as e:
+                    self._record_error(f"Failed to list objects: {e}")
+                    continue
+                self._increment("files_checked", len(objects))
+                for obj in objects:
+                    copy = executor.submit(
+                        self.copy_file, source_tenancy, obj.name, obj.size or 0
+                    )
+                    copies[copy] = obj.name
+
+            # One failed file must not discard the stats of the others
+            for copy, name in copies.items():
+                try:
+                    copy.result()
+                except Exception as e:
+                    self._record_error(f"Failed to copy {name}: {e}")
 
         # Log summary
         logger.info(
-            f"Complete: {self.stats['files_copied']} copied, "
-            f"{self.stats['files_skipped']} skipped, "
-            f"{len(self.stats['errors'])} errors"
+            "Complete: %d copied, %d skipped, %d errors",
+            self.stats["files_copied"],
+            self.stats["files_skipped"],
+            len(self.stats["errors"])
         )
 
         return self.stats
@@ -17,13 +17,18 @@ All other fields (principalId, principalName, ipAddress, eventType,
 request path, compartmentId, etc.) are preserved for SIEM correlation.
 
 Author:  Rishabh Ghosh (rishabh.g.ghosh@oracle.com)
-Version: 1.1.0
-Date:    2026-02-13
+Version: 1.2.0
+Date:    2026-10-16
 
 Changelog:
   1.0.0  2026-02-12  Initial release — credential & auth header masking
   1.1.0  2026-02-13  Added opc-principal/opc-obo-principal header masking;
                       added deep scan for embedded ST$ tokens in string values
+  1.2.0  2026-10-16  mask_sensitive_fields now redacts its input in place and
+                      returns it, instead of returning a masked copy;
+                      secret patterns matched as one regex (RE2 when
+                      google-re2 is installed); optional orjson
+                      serialization
 """
 
 import io
@@ -33,6 +38,16 @@ import gzip
 import re
 from fdk import response
 
+try:
+    import orjson  # optional: add "orjson" to requirements.txt for faster JSON
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # optional: add "google-re2" for linear-time secret matching
+except ImportError:
+    re2 = None
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -56,8 +71,46 @@ SECRET_VALUE_PATTERNS = [
     re.compile(r"^Basic\s+", re.IGNORECASE),            # Basic auth
 ]
 
+# Each built-in pattern needs a "$" or whitespace to match, and at least
+# 3 characters. Most audit strings (OCIDs, IPs, timestamps, paths) have
+# neither, so they can skip the regex. Only valid while every configured
+# pattern is a built-in one, compiled with its built-in flags.
+_BUILTIN_SECRET_PATTERNS = frozenset({
+    (r"ST\$", re.UNICODE),
+    (r"Signature\s+keyId=", re.UNICODE | re.IGNORECASE),
+    (r"^Bearer\s+", re.UNICODE | re.IGNORECASE),
+    (r"^Basic\s+", re.UNICODE | re.IGNORECASE),
+})
+SECRET_PREFILTER = all(
+    (p.pattern, p.flags) in _BUILTIN_SECRET_PATTERNS
+    for p in SECRET_VALUE_PATTERNS
+)
+
+# With only built-in patterns, scan each value once with a single
+# alternation; flags are scoped per alternative to keep ST$ case-sensitive.
+# Custom patterns may carry flags or inline flags that do not survive the
+# merge, so they are searched one by one (SECRET_VALUE_RE is None).
+SECRET_VALUE_RE = None
+if SECRET_PREFILTER:
+    _SECRET_VALUE_SOURCE = "|".join(
+        f"(?i:{p.pattern})" if p.flags & re.IGNORECASE else f"(?:{p.pattern})"
+        for p in SECRET_VALUE_PATTERNS
+    )
+    SECRET_VALUE_RE = re.compile(_SECRET_VALUE_SOURCE)
+
+    # Match with RE2 when installed: it never backtracks, so long header
+    # values scan in linear time. RE2's \s is ASCII-only, so it is spelled
+    # out as exactly the set Python's \s matches.
+    if re2 is not None:
+        SECRET_VALUE_RE = re2.compile(
+            _SECRET_VALUE_SOURCE.replace(r"\s", r"[\s\x0b\x1c-\x1f\x85\p{Z}]")
+        )
+
 REDACTION_PLACEHOLDER = "[REDACTED]"
 
+# Pre-computed lowercase set for fast key lookups during masking
+REDACT_KEYS_LOWER = frozenset(k.lower() for k in REDACT_KEYS)
+
 logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger("audit-log-masking")
 
@@ -68,54 +121,44 @@ logger = logging.getLogger("audit-log-masking")
 
 def _should_redact_value(value: str) -> bool:
     """Check if a string value matches known secret patterns."""
-    for pattern in SECRET_VALUE_PATTERNS:
-        if pattern.search(value):
-            return True
-    return False
-
-
-def _mask_list(parent_key, items: list) -> list:
-    """Process a list, masking string elements when appropriate."""
-    result = []
-    for item in items:
-        if isinstance(item, str):
-            if parent_key and parent_key.lower() in {k.lower() for k in REDACT_KEYS}:
-                result.append(REDACTION_PLACEHOLDER)
-            elif _should_redact_value(item):
-                result.append(REDACTION_PLACEHOLDER)
-            else:
-                result.append(item)
-        elif isinstance(item, (dict, list)):
-            result.append(mask_sensitive_fields(item))
-        else:
-            result.append(item)
-    return result
+    if SECRET_PREFILTER:
+        if len(value) < 3:
+            return False
+        # \s only matches an ASCII space or a non-printable character
+        if "$" not in value and " " not in value and value.isprintable():
+            return False
+        return SECRET_VALUE_RE.search(value) is not None
+    return any(p.search(value) for p in SECRET_VALUE_PATTERNS)
 
 
 def mask_sensitive_fields(data):
-    """Recursively traverse a parsed JSON structure and redact
-    replayable authentication credentials."""
-    if isinstance(data, dict):
-        masked = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                if key.lower() in {k.lower() for k in REDACT_KEYS}:
-                    masked[key] = REDACTION_PLACEHOLDER
-                elif _should_redact_value(value):
-                    masked[key] = REDACTION_PLACEHOLDER
-                else:
-                    masked[key] = value
-            elif isinstance(value, list):
-                masked[key] = _mask_list(key, value)
-            elif isinstance(value, dict):
-                masked[key] = mask_sensitive_fields(value)
-            else:
-                masked[key] = value
-        return masked
-
-    elif isinstance(data, list):
-        return _mask_list(None, data)
+    """Traverse a parsed JSON structure and redact replayable
+    authentication credentials in place.
 
+    Walks the tree with an explicit stack and only writes to a container
+    when a value is redacted, so nothing is copied. Returns ``data``.
+    """
+    # (container, key of the list in its parent dict, or None)
+    stack = [(data, None)]
+    while stack:
+        container, parent_key = stack.pop()
+        if isinstance(container, dict):
+            for key, value in container.items():
+                if isinstance(value, str):
+                    if key.lower() in REDACT_KEYS_LOWER or _should_redact_value(value):
+                        container[key] = REDACTION_PLACEHOLDER
+                elif isinstance(value, list):
+                    stack.append((value, key))
+                elif isinstance(value, dict):
+                    stack.append((value, None))
+        elif isinstance(container, list):
+            redact_strings = bool(parent_key) and parent_key.lower() in REDACT_KEYS_LOWER
+            for index, item in enumerate(container):
+                if isinstance(item, str):
+                    if redact_strings or _should_redact_value(item):
+                        container[index] = REDACTION_PLACEHOLDER
+                elif isinstance(item, (dict, list)):
+                    stack.append((item, None))
     return data
 
 
@@ -137,7 +180,7 @@ def handler(ctx, data: io.BytesIO = None):
             return _json_response(ctx, [])
 
         # Decompress if gzipped
-        if body[:2] == b"\x1f\x8b":
+        if body.startswith(b"\x1f\x8b"):
             try:
                 body = gzip.decompress(body)
             except Exception as e:
@@ -145,7 +188,7 @@ def handler(ctx, data: io.BytesIO = None):
 
         # Parse JSON
         try:
-            payload = json.loads(body.decode("utf-8"))
+            payload, has_constants = _json_loads(body)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             logger.error(f"JSON parse failed: {e}")
             return _raw_response(ctx, body)
@@ -160,12 +203,13 @@ def handler(ctx, data: io.BytesIO = None):
         else:
             return _raw_response(ctx, body)
 
-        # Mask each event
-        masked_events = [mask_sensitive_fields(event) for event in events]
+        # Mask each event in place
+        for event in events:
+            mask_sensitive_fields(event)
 
         # Return same shape as received
-        output = masked_events[0] if was_single else masked_events
-        return _json_response(ctx, output)
+        output = events[0] if was_single else events
+        return _json_response(ctx, output, use_orjson=not has_constants)
 
     except Exception as e:
         logger.error(f"Unhandled error in masking function: {e}", exc_info=True)
@@ -173,14 +217,51 @@ def handler(ctx, data: io.BytesIO = None):
         return _raw_response(ctx, body)
 
 
+# ---------------------------------------------------------------------------
+# JSON helpers
+# ---------------------------------------------------------------------------
+
+def _json_loads(body: bytes):
+    """Parse a JSON body with the stdlib.
+
+    orjson is not used here: it turns integers beyond 64 bits into floats,
+    and ruling those out costs more than the parse itself.
+
+    Returns the payload and whether it held NaN/Infinity.
+    """
+    constants = []
+
+    def parse_constant(name):
+        constants.append(name)
+        return float(name)
+
+    payload = json.loads(body, parse_constant=parse_constant)
+    return payload, bool(constants)
+
+
+def _json_dumps(data, use_orjson: bool = True):
+    """Serialize compact JSON, using orjson when installed.
+
+    Pass use_orjson=False for payloads holding NaN/Infinity: orjson would
+    write them as null. Integers beyond 64 bits make orjson raise, so
+    those payloads fall back to the stdlib.
+    """
+    if orjson is not None and use_orjson:
+        try:
+            return orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, separators=(",", ":"))
+
+
 # ---------------------------------------------------------------------------
 # Response helpers
 # ---------------------------------------------------------------------------
 
-def _json_response(ctx, data):
+def _json_response(ctx, data, use_orjson: bool = True):
     return response.Response(
         ctx,
-        response_data=json.dumps(data, separators=(",", ":")),
+        response_data=_json_dumps(data, use_orjson),
         headers={"Content-Type": "application/json"},
     )
 
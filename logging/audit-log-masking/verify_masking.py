@@ -26,6 +26,7 @@ import argparse
 import base64
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import oci
@@ -34,6 +35,9 @@ except ImportError:
     sys.exit(1)
 
 
+# Messages requested per get_messages call
+MESSAGES_PER_REQUEST = 100
+
 # ---------------------------------------------------------------------------
 # Fields to check
 # ---------------------------------------------------------------------------
@@ -173,6 +177,21 @@ def validate_event(event, index):
     return failed == 0
 
 
+def decode_message(msg):
+    """Decode a stream message into an event. Returns (event, error)."""
+    try:
+        # json.loads takes the decoded bytes directly
+        return json.loads(base64.b64decode(msg.value)), None
+    except Exception as e:
+        return None, e
+
+
+def fetch_messages(stream_client, stream_id, cursor, limit):
+    """Read one batch of messages. Returns (messages, next cursor)."""
+    response = stream_client.get_messages(stream_id, cursor, limit=limit)
+    return response.data, response.headers.get("opc-next-cursor")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Verify OCI audit log masking by reading from a Streaming topic"
@@ -226,39 +245,52 @@ def main():
     )
     cursor = cursor_response.data.value
 
-    # Read messages
-    messages_response = stream_client.get_messages(
-        args.stream_id,
-        cursor,
-        limit=args.limit
+    # Read the first batch
+    remaining = args.limit
+    messages, cursor = fetch_messages(
+        stream_client, args.stream_id, cursor, min(remaining, MESSAGES_PER_REQUEST)
     )
-    messages = messages_response.data
 
     if not messages:
         print("No messages found in the stream.")
         print("Trigger some audit events (browse OCI console) and wait ~2 minutes.")
         sys.exit(0)
 
-    print(f"Retrieved {len(messages)} message(s)")
-
     # --- Validate each message ---
     all_passed = True
     has_checkable = False
-    for i, msg in enumerate(messages, 1):
-        try:
-            decoded = base64.b64decode(msg.value).decode("utf-8")
-            event = json.loads(decoded)
-        except Exception as e:
-            print(f"\n⚠  Message {i}: failed to decode — {e}")
-            all_passed = False
-            continue
-
-        if args.raw:
-            print(f"\n--- Raw JSON (Message {i}) ---")
-            print(json.dumps(event, indent=2)[:3000])
-
-        if not validate_event(event, i):
-            all_passed = False
+    i = 0
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        while messages:
+            remaining -= len(messages)
+            print(f"Retrieved {len(messages)} message(s)")
+
+            # Fetch the next batch while this one is being validated
+            next_batch = None
+            if remaining > 0 and cursor:
+                next_batch = prefetcher.submit(
+                    fetch_messages, stream_client, args.stream_id, cursor,
+                    min(remaining, MESSAGES_PER_REQUEST)
+                )
+
+            for msg in messages:
+                event, error = decode_message(msg)
+                i += 1
+                if error is not None:
+                    print(f"\n⚠  Message {i}: failed to decode — {error}")
+                    all_passed = False
+                    continue
+
+                if args.raw:
+                    print(f"\n--- Raw JSON (Message {i}) ---")
+                    print(json.dumps(event, indent=2)[:3000])
+
+                if not validate_event(event, i):
+                    all_passed = False
+
+            if next_batch is None:
+                break
+            messages, cursor = next_batch.result()
 
     # --- Summary ---
     print(f"\n{'=' * 60}")